@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import os
 from run import process_interest_rates
 
 def interest_rates_page():
@@ -18,17 +19,19 @@ def interest_rates_page():
     st.write("Current interest rates and requirements for supported banks. Updated as of 16 Jan 2025.")
     
     # Load bank data
-    banks_data = process_interest_rates()
+    banks_data = process_interest_rates('interest_rates.csv', os.path.getmtime('interest_rates.csv'))
     
-    # Convert banks_data dictionary to a list of records
-    records = []
+    # Build the table column by column rather than from per-tier row dicts
+    cols = ['tier_type', 'balance_tier', 'interest_rate', 'requirement_type', 'remarks']
+    columns = {'bank': [], **{col: [] for col in cols}}
     for bank_name, bank_info in banks_data.items():
         for tier in bank_info['tiers']:
-            tier['bank'] = bank_name  # Add bank name to each tier
-            records.append(tier)
+            columns['bank'].append(bank_name)
+            for col in cols:
+                columns[col].append(tier[col])
     
     # Convert to DataFrame
-    interest_rates_df = pd.DataFrame(records)
+    interest_rates_df = pd.DataFrame(columns)
     
     # Add bank selector
     selected_bank = st.selectbox(
@@ -41,7 +44,6 @@ def interest_rates_page():
     bank_data = interest_rates_df[interest_rates_df['bank'] == selected_bank]
     
     # Create a formatted table
-    cols = ['tier_type', 'balance_tier', 'interest_rate', 'requirement_type', 'remarks']
     display_df = bank_data[cols].copy()
     display_df.columns = ['Tier Type', 'Balance Tier', 'Interest Rate (%)', 'Requirement', 'Remarks']
     
@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from scipy.optimize import linprog
+import functools
+import os
 import traceback
 from analytics import (
     identify_user, 
@@ -12,7 +13,39 @@ from analytics import (
 )
 
 
+def fill_tiers(amount, caps):
+    """Split an amount across consecutive tier caps, returning the amount that lands in each tier"""
+    caps = np.asarray(caps, dtype=float)
+    filled_before = np.cumsum(caps) - caps
+    return np.clip(amount - filled_before, 0, caps)
+
 def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
+    """
+    Calculate interest based on the bank's tier structure and requirements
+    Results are memoized, so callers must not mutate the returned dict
+    """
+    return _calc_interest_cached(deposit_amount, *_interest_cache_key(bank_info, bank_requirements), True)
+
+def calculate_bank_interest_total(deposit_amount, bank_info, bank_requirements):
+    """Calculate total interest only, skipping the per-tier breakdown needed for display"""
+    result = _calc_interest_cached(deposit_amount, *_interest_cache_key(bank_info, bank_requirements), False)
+    return result['total_interest']
+
+def _interest_cache_key(bank_info, bank_requirements):
+    """Hashable snapshot of the bank and requirement dicts"""
+    tiers_key = bank_info.get('tiers_key')
+    if tiers_key is None:
+        tiers_key = tuple(tuple(tier.items()) for tier in bank_info['tiers'])
+    requirements_key = tuple(sorted(bank_requirements.items()))
+    return bank_info['bank'], tiers_key, requirements_key
+
+@functools.lru_cache(maxsize=512)
+def _calc_interest_cached(deposit_amount, bank_name, tiers_key, requirements_key, with_breakdown):
+    """Rebuild the bank and requirement dicts from their hashable keys and calculate interest"""
+    bank_info = {'bank': bank_name, 'tiers': [dict(tier) for tier in tiers_key]}
+    return _calculate_bank_interest(deposit_amount, bank_info, dict(requirements_key), with_breakdown)
+
+def _calculate_bank_interest(deposit_amount, bank_info, bank_requirements, with_breakdown=True):
     """Calculate interest based on the bank's tier structure and requirements"""
     total_interest = 0
     breakdown = []
@@ -22,6 +55,8 @@ def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
         interest = amount * rate
         # Debug print
         # print(f"Adding tier: amount={amount}, rate={rate}, description={description}")
+        if not with_breakdown:
+            return interest
         breakdown.append({
             'amount_in_tier': float(amount),
             'tier_rate': float(rate),
@@ -40,7 +75,7 @@ def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
         
         # Always add base interest for total balance
         base_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'base')
-        base_rate = float(str(base_tier['interest_rate']).strip('%')) / 100
+        base_rate = base_tier['rate']
         total_interest += add_tier(deposit_amount, base_rate, "Base Interest")
         
         # Cap bonus interest at $100,000
@@ -48,74 +83,67 @@ def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
         
         # Add salary bonus if applicable
         if bank_requirements['has_salary'] and bank_requirements['salary_amount'] >= min_salary:
-            rate = float(str(salary_tier['interest_rate']).strip('%')) / 100
+            rate = salary_tier['rate']
             total_interest += add_tier(eligible_amount, rate, f"Salary Credit Bonus (>= ${min_salary:,.0f})")
         
         # Add spend bonus if applicable
         if bank_requirements['spend_amount'] >= min_spend:
-            rate = float(str(spend_tier['interest_rate']).strip('%')) / 100
+            rate = spend_tier['rate']
             total_interest += add_tier(eligible_amount, rate, f"Card Spend Bonus (>= ${min_spend:,.0f})")
         
         # Add investment bonus if applicable
         if bank_requirements['has_investments']:
             invest_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'invest')
-            rate = float(str(invest_tier['interest_rate']).strip('%')) / 100
+            rate = invest_tier['rate']
             total_interest += add_tier(eligible_amount, rate, "Investment Bonus (6 months)")
         
         # Add insurance bonus if applicable
         if bank_requirements['has_insurance']:
             insure_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'insure')
-            rate = float(str(insure_tier['interest_rate']).strip('%')) / 100
+            rate = insure_tier['rate']
             total_interest += add_tier(eligible_amount, rate, "Insurance Bonus (6 months)")
             
     elif bank_info['bank'] == 'UOB One':
         # First add base interest for entire amount
         base_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'base')
-        base_rate = float(str(base_tier['interest_rate']).strip('%')) / 100
+        base_rate = base_tier['rate']
         total_interest += add_tier(deposit_amount, base_rate, "Base interest rate")
         
         # Then add bonus interest based on requirements
         if bank_requirements['spend_amount'] >= 500:
-            remaining_amount = deposit_amount
             if bank_requirements['meets_criteria_a']:
                 # Criteria A + Spend
                 tiers = [t for t in bank_info['tiers'] if t['tier_type'] == 'criteria_a']
-                for tier in tiers:
-                    amount_in_tier = min(float(tier['cap_amount']), remaining_amount)
-                    rate = float(str(tier['interest_rate']).strip('%')) / 100
-                    bonus_rate = rate - base_rate  # Subtract base rate to get bonus
-                    interest = amount_in_tier * bonus_rate
-                    total_interest += interest
-                    add_tier(amount_in_tier, bonus_rate, 
-                        f"Salary Credit  + Credit Card Spend (${bank_requirements['spend_amount']:,.2f}) for {tier['balance_tier']}")
-                    remaining_amount -= amount_in_tier
-                    if remaining_amount <= 0:
-                        break
             else:
                 # Spend only (bonus interest)
                 tiers = [t for t in bank_info['tiers'] if t['tier_type'] == 'spend_only']
-                for tier in tiers:
-                    amount_in_tier = min(float(tier['cap_amount']), remaining_amount)
-                    rate = float(str(tier['interest_rate']).strip('%')) / 100
-                    bonus_rate = rate - base_rate  # Subtract base rate to get bonus
-                    interest = amount_in_tier * bonus_rate
-                    total_interest += interest
-                    add_tier(amount_in_tier, bonus_rate, 
-                        f"Credit card spend (${bank_requirements['spend_amount']:,.2f}) interest")
-                    remaining_amount -= amount_in_tier
-                    if remaining_amount <= 0:
-                        break
+            
+            caps = np.array([float(t['cap_amount']) for t in tiers])
+            
+            # Stop at the tier that exhausts the deposit; later tiers get nothing and are not listed
+            num_tiers = min(int(np.searchsorted(np.cumsum(caps), deposit_amount)) + 1, len(tiers))
+            tiers, caps = tiers[:num_tiers], caps[:num_tiers]
+            
+            rates = np.array([t['rate'] for t in tiers])
+            amounts_in_tier = fill_tiers(deposit_amount, caps)
+            bonus_rates = rates - base_rate  # Subtract base rate to get bonus
+            
+            for tier, amount_in_tier, bonus_rate in zip(tiers, amounts_in_tier, bonus_rates):
+                if bank_requirements['meets_criteria_a']:
+                    description = f"Salary Credit  + Credit Card Spend (${bank_requirements['spend_amount']:,.2f}) for {tier['balance_tier']}"
+                else:
+                    description = f"Credit card spend (${bank_requirements['spend_amount']:,.2f}) interest"
+                total_interest += add_tier(amount_in_tier, bonus_rate, description)
     
     elif bank_info['bank'] == 'OCBC 360':
         # Always add base interest first for total amount
         base_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'base')
-        base_rate = float(str(base_tier['interest_rate']).strip('%')) / 100
+        base_rate = base_tier['rate']
         total_interest = deposit_amount * base_rate
         add_tier(deposit_amount, base_rate, "Base Interest")
         
         # Get tiers for first $75k and next $25k
-        first_75k = min(deposit_amount, 75000)
-        next_25k = min(max(deposit_amount - 75000, 0), 25000)
+        first_75k, next_25k = fill_tiers(deposit_amount, [75000, 25000])
         
         # Base calculations for each amount
         total_first_75k = 0
@@ -128,13 +156,13 @@ def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
                 tier_25k = next((t for t in bank_info['tiers'] if t['tier_type'] == tier_type and float(t['cap_amount']) == 25000), None)
                 
                 if tier_75k:
-                    rate = float(str(tier_75k['interest_rate']).strip('%')) / 100
+                    rate = tier_75k['rate']
                     interest_75k = first_75k * rate
                     total_first_75k += interest_75k
                     add_tier(first_75k, rate, f"{tier_75k['remarks']}")
                 
                 if tier_25k:
-                    rate = float(str(tier_25k['interest_rate']).strip('%')) / 100
+                    rate = tier_25k['rate']
                     interest_25k = next_25k * rate
                     total_next_25k += interest_25k
                     add_tier(next_25k, rate, f"{tier_25k['remarks']}")
@@ -167,7 +195,7 @@ def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
     elif bank_info['bank'] == 'BOC SmartSaver':
         # Always add base interest first for total amount
         base_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'base')
-        base_rate = float(str(base_tier['interest_rate']).strip('%')) / 100
+        base_rate = base_tier['rate']
         total_interest = deposit_amount * base_rate
         add_tier(deposit_amount, base_rate, "Base Interest")
         
@@ -177,14 +205,14 @@ def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
         # Wealth bonus (Insurance)
         if bank_requirements['has_insurance']:
             wealth_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'wealth')
-            rate = float(str(wealth_tier['interest_rate']).strip('%')) / 100
+            rate = wealth_tier['rate']
             total_interest += add_tier(eligible_amount_100k, rate, "Insurance Purchase Bonus")
         
         # Card spend bonus
         if bank_requirements['spend_amount'] >= 500:
             spend_tiers = [t for t in bank_info['tiers'] if t['tier_type'] == 'spend']
             spend_tier = spend_tiers[1] if bank_requirements['spend_amount'] >= 1500 else spend_tiers[0]
-            rate = float(str(spend_tier['interest_rate']).strip('%')) / 100
+            rate = spend_tier['rate']
             
             # Debug print
             # print(f"Spend tier description: {spend_tier['remarks']}")
@@ -196,13 +224,13 @@ def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
         # Salary bonus
         if bank_requirements['has_salary'] and bank_requirements['salary_amount'] >= 2000:
             salary_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'salary')
-            rate = float(str(salary_tier['interest_rate']).strip('%')) / 100
+            rate = salary_tier['rate']
             total_interest += add_tier(eligible_amount_100k, rate, "Salary Credit Bonus")
         
         # Payment bonus
         if bank_requirements['giro_count'] >= 3:
             payment_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'payment')
-            rate = float(str(payment_tier['interest_rate']).strip('%')) / 100
+            rate = payment_tier['rate']
             total_interest += add_tier(eligible_amount_100k, rate, "Bill Payment Bonus")
         
         # Extra savings bonus (applies to balance above $100k up to $1M)
@@ -215,34 +243,31 @@ def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
         
         if has_qualifying_bonus and deposit_amount > 100000:
             extra_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'extra')
-            rate = float(str(extra_tier['interest_rate']).strip('%')) / 100
+            rate = extra_tier['rate']
             extra_amount = min(deposit_amount - 100000, 900000)  # Cap at $1M total
             total_interest += add_tier(extra_amount, rate, "Extra Savings Bonus (>$100k)")
     
     elif bank_info['bank'] == 'Chocolate':
         # First add base interest for total amount
         base_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'base')
-        base_rate = float(str(base_tier['interest_rate']).strip('%')) / 100
+        base_rate = base_tier['rate']
         total_interest = deposit_amount * base_rate
         # add_tier(deposit_amount, base_rate, "Base Interest")
         
         # Then add bonus interest for tiered amounts
-        first_20k = min(deposit_amount, 20000)
-        next_30k = min(max(deposit_amount - 20000, 0), 30000)
+        first_20k, next_30k = fill_tiers(deposit_amount, [20000, 30000])
         
         # First $20,000 at 3.60%
-        first_20k = min(deposit_amount, 20000)
         first_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'base' and float(t['cap_amount']) == 20000)
-        rate_20k = float(str(first_tier['interest_rate']).strip('%')) / 100
+        rate_20k = first_tier['rate']
         interest_20k = first_20k * rate_20k
         total_interest = interest_20k
         add_tier(first_20k, rate_20k, "First $20,000")
         
         # Next $30,000 at 3.20%
         if deposit_amount > 20000:
-            next_30k = min(deposit_amount - 20000, 30000)
             second_tier = next(t for t in bank_info['tiers'] if t['tier_type'] == 'base' and float(t['cap_amount']) == 30000)
-            rate_30k = float(str(second_tier['interest_rate']).strip('%')) / 100
+            rate_30k = second_tier['rate']
             interest_30k = next_30k * rate_30k
             total_interest += interest_30k
             add_tier(next_30k, rate_30k, "Next $30,000")
@@ -252,48 +277,63 @@ def calculate_bank_interest(deposit_amount, bank_info, bank_requirements):
         'breakdown': breakdown
     }
 
-def process_interest_rates(file_path='interest_rates.csv'):
-    """Process interest rates from CSV file"""
+@st.cache_data(show_spinner=False)
+def process_interest_rates(file_path='interest_rates.csv', file_mtime=None):
+    """
+    Process interest rates from CSV file
+    Cached across reruns; pass the file's mtime so edits to the CSV invalidate the cache
+    """
     print("Starting to process interest rates...")
-    df = pd.read_csv(file_path)
+    # Only load the columns used downstream, with explicit dtypes to skip inference
+    df = pd.read_csv(
+        file_path,
+        usecols=[
+            'bank', 'tier_type', 'balance_tier', 'interest_rate', 'requirement_type', 'min_spend',
+            'min_salary', 'giro_count', 'salary_credit', 'cap_amount', 'remarks'
+        ],
+        dtype={
+            'bank': 'string',
+            'tier_type': 'category',
+            'balance_tier': 'string',
+            'interest_rate': 'string',
+            'requirement_type': 'category',
+            'min_spend': 'float32',
+            'min_salary': 'float32',
+            'giro_count': 'float32',
+            'salary_credit': 'category',
+            'cap_amount': 'float32',
+            'remarks': 'string'
+        }
+    )
     print(f"Loaded CSV with {len(df)} rows")
+    
+    # Missing remarks become empty strings once here, rather than NA values in every tier
+    df['remarks'] = df['remarks'].fillna('')
     banks_data = {}
     
+    tier_columns = [
+        'tier_type', 'balance_tier', 'interest_rate', 'rate', 'requirement_type', 'min_spend',
+        'min_salary', 'giro_count', 'salary_credit', 'cap_amount', 'remarks'
+    ]
+    
+    # Parse every percentage string once into a decimal rate, dropping tiers where it is invalid
+    rates = pd.to_numeric(df['interest_rate'].astype(str).str.strip('%'), errors='coerce')
+    invalid = rates.isna() & df['interest_rate'].notna()
+    if invalid.any():
+        print(f"Skipping {invalid.sum()} tiers with invalid interest rates: {df.loc[invalid, 'interest_rate'].tolist()}")
+    df = df.assign(rate=rates / 100)[~invalid]
+    
     # Group by bank
     for bank_name, bank_group in df.groupby('bank'):
         print(f"\nProcessing bank: {bank_name}")
         try:
-            # Initialize bank data
+            tiers = bank_group[tier_columns].to_dict('records')
             banks_data[bank_name] = {
                 'bank': bank_name,
-                'tiers': []
+                'tiers': tiers,
+                # Hashable snapshot of the tiers, used as the interest cache key
+                'tiers_key': tuple(tuple(tier.items()) for tier in tiers)
             }
-            
-            # Process all tiers
-            for _, row in bank_group.iterrows():
-                try:
-                    # Convert interest rate from percentage string to float
-                    rate = float(str(row['interest_rate']).strip('%')) / 100
-                    
-                    tier = {
-                        'tier_type': row['tier_type'],
-                        'balance_tier': row['balance_tier'],
-                        'interest_rate': row['interest_rate'],
-                        'requirement_type': row['requirement_type'],
-                        'min_spend': row['min_spend'],
-                        'min_salary': row['min_salary'],
-                        'giro_count': row['giro_count'],
-                        'salary_credit': row['salary_credit'],
-                        'cap_amount': row['cap_amount'],
-                        'remarks': row['remarks']
-                    }
-                    
-                    banks_data[bank_name]['tiers'].append(tier)
-                    print(f"Added tier: {tier}")
-                    
-                except (ValueError, TypeError) as e:
-                    print(f"Error processing tier: {e}")
-            
             print(f"Successfully added {len(banks_data[bank_name]['tiers'])} tiers for {bank_name}")
                 
         except Exception as e:
@@ -304,16 +344,16 @@ def process_interest_rates(file_path='interest_rates.csv'):
     print(f"\nFinished processing. Found {len(banks_data)} banks")
     return banks_data
 
-def optimize_bank_distribution(total_amount, banks_data, user_requirements):
+@st.cache_data(max_entries=64, show_spinner=False)
+def find_top_distributions(total_amount, _banks_data, user_requirements, file_mtime):
+    """
+    Find the top 3 deposit distributions without touching the Streamlit UI
+    Cached per deposit amount and requirements; banks_data is not hashed, so the
+    interest rates file's mtime stands in for it in the cache key
+    """
+    banks_data = _banks_data
     print(f"\nOptimizing distribution for ${total_amount:,.2f}")
     
-    # Initialize variables for top 3 solutions
-    top_solutions = [
-        {'distribution': {}, 'total_interest': 0, 'breakdown': {}, 'salary_bank': None},
-        {'distribution': {}, 'total_interest': 0, 'breakdown': {}, 'salary_bank': None},
-        {'distribution': {}, 'total_interest': 0, 'breakdown': {}, 'salary_bank': None}
-    ]
-
     # Define maximum bonus interest caps for each bank
     bonus_caps = {
         'UOB One': 150000,
@@ -323,107 +363,143 @@ def optimize_bank_distribution(total_amount, banks_data, user_requirements):
         'Chocolate': 50000
     }
 
-    # Create progress placeholders in Streamlit
-    status_text = st.empty()
-    progress_text = st.empty()
-    best_found_text = st.empty()
-    
-    # Initialize counters
-    total_scenarios = 0
-    current_scenario = 0
-    
-    # Calculate total number of scenarios
-    def calculate_total_scenarios(amount, num_banks):
-        # Number of possible $5000 increments for each bank
-        increments_per_bank = (amount // 5000) + 1
-        # Total combinations considering all banks
-        return increments_per_bank ** num_banks
-
-    # Calculate approximate total scenarios
-    if user_requirements['has_salary']:
-        for salary_bank in ['SC BonusSaver', 'OCBC 360', 'BOC SmartSaver']:
-            total_scenarios += calculate_total_scenarios(min(total_amount, bonus_caps[salary_bank]), 4)  # 4 other banks
-    total_scenarios += calculate_total_scenarios(total_amount, 5)  # non-salary scenarios
-    
-    progress_text.write(f"Total scenarios to check: {total_scenarios:,}")
+    # Deposits are allocated in $5000 increments; anything under $5000 is left unallocated
+    step = 5000
+    total_steps = int(total_amount // step)
+    num_solutions = 3
+
+    all_banks = ['UOB One', 'SC BonusSaver', 'OCBC 360', 'BOC SmartSaver', 'Chocolate']
+    salary_banks = ['SC BonusSaver', 'OCBC 360', 'BOC SmartSaver']
+    other_banks = [bank for bank in all_banks if bank not in salary_banks]
+
+    # Build each bank's requirements once, with and without salary credit,
+    # instead of copying user_requirements for every table and solution
+    requirements_without_salary = {}
+    for bank in all_banks:
+        bank_reqs = user_requirements.copy()
+        if bank == 'UOB One':
+            bank_reqs['meets_criteria_a'] = user_requirements.get('meets_criteria_a', False)
+        else:
+            bank_reqs['has_salary'] = False
+        requirements_without_salary[bank] = bank_reqs
+    requirements_with_salary = {
+        bank: {**requirements_without_salary[bank], 'has_salary': user_requirements['has_salary']}
+        for bank in salary_banks
+    }
+
+    def bank_requirements(bank, salary_bank):
+        if bank == salary_bank:
+            return requirements_with_salary[bank]
+        return requirements_without_salary[bank]
+
+    def interest_table(bank, salary_bank):
+        """Total interest for each $5000 increment deposited in a bank, up to its bonus cap"""
+        bank_reqs = bank_requirements(bank, salary_bank)
+        max_steps = min(total_steps, bonus_caps[bank] // step)
+        table = np.zeros(max_steps + 1, dtype=np.float32)
+        for steps in range(1, max_steps + 1):
+            table[steps] = calculate_bank_interest_total(steps * step, banks_data[bank], bank_reqs)
+        return table
+
+    def empty_state():
+        """DP state before any bank is added: only $0 allocated, with no interest"""
+        values = np.full((total_steps + 1, num_solutions), -np.inf, dtype=np.float32)
+        values[0, 0] = 0
+        allocations = np.zeros((total_steps + 1, num_solutions, 0), dtype=int)
+        return values, allocations
 
-    def try_combination(amounts_dict, salary_bank):
-        nonlocal current_scenario
-        current_scenario += 1
+    def add_bank(state, table):
+        """
+        Extend the dynamic programming state with one more bank.
+        values[used, k] is the interest of the k-th best partial solution that allocates
+        exactly `used` increments so far (-inf if there is none), and allocations[used, k]
+        holds its steps per bank.
+        """
+        values, allocations = state
         
-        if current_scenario % 100 == 0:  # Update more frequently since we have fewer scenarios
-            progress_text.write(f"Checking scenario {current_scenario:,} of {total_scenarios:,} ({(current_scenario/total_scenarios*100):.1f}%)")
+        # candidates[used, steps, k] = values[used - steps, k] + table[steps]
+        shifted = [values] + [
+            np.vstack([np.full((steps, num_solutions), -np.inf, dtype=np.float32), values[:-steps]])
+            for steps in range(1, len(table))
+        ]
+        candidates = np.stack(shifted, axis=1) + table[None, :, None]
+        candidates = candidates.reshape(total_steps + 1, -1)
         
-        if abs(sum(amounts_dict.values()) - total_amount) > 5000:  # Increased tolerance for $5000 increments
-            return
-            
-        total_interest = 0
-        all_breakdowns = {}
-        
-        for bank, amount in amounts_dict.items():
-            if amount > 0:
-                bank_reqs = user_requirements.copy()
-                if bank == 'UOB One':
-                    bank_reqs['meets_criteria_a'] = user_requirements.get('meets_criteria_a', False)
-                else:
-                    bank_reqs['has_salary'] = (bank == salary_bank) and user_requirements['has_salary']
-                
-                result = calculate_bank_interest(amount, banks_data[bank], bank_reqs)
-                total_interest += result['total_interest']
-                all_breakdowns[bank] = result['breakdown']
-        
-        for i in range(len(top_solutions)):
-            if total_interest > top_solutions[i]['total_interest']:
-                for j in range(len(top_solutions)-1, i, -1):
-                    top_solutions[j] = top_solutions[j-1].copy()
-                top_solutions[i] = {
-                    'distribution': amounts_dict.copy(),
-                    'total_interest': total_interest,
-                    'breakdown': all_breakdowns,
-                    'salary_bank': salary_bank
-                }
-                best_found_text.write(f"New best found: ${total_interest:,.2f} with {amounts_dict}")
-                break
-
-    def try_all_combinations(remaining_amount, remaining_banks, current_distribution, salary_bank):
-        if not remaining_banks:
-            if remaining_amount < 5000:  # If less than $5000 left, consider it a valid combination
-                try_combination(current_distribution, salary_bank)
-            return
+        # Stable sort keeps the first-found candidate on ties
+        order = np.argsort(-candidates, axis=1, kind='stable')[:, :num_solutions]
+        new_values = np.take_along_axis(candidates, order, axis=1)
+        steps, k = np.divmod(order, num_solutions)
+        prev_used = np.maximum(np.arange(total_steps + 1)[:, None] - steps, 0)
+        new_allocations = np.concatenate([allocations[prev_used, k], steps[..., None]], axis=2)
+        return new_values, new_allocations
+
+    def to_solutions(state, banks, salary_bank, display_order):
+        """Turn the full allocations in the DP state into solution dicts"""
+        values, allocations = state
         
-        current_bank = remaining_banks[0]
-        next_banks = remaining_banks[1:]
-        
-        # Try different amounts in $5000 increments
-        max_amount = min(remaining_amount, bonus_caps[current_bank])
-        for amount in range(0, max_amount + 5000, 5000):  # Include 0 to skip this bank
-            if amount <= max_amount:
-                new_distribution = current_distribution.copy()
-                if amount > 0:  # Only add to distribution if amount > 0
-                    new_distribution[current_bank] = amount
-                try_all_combinations(remaining_amount - amount, next_banks, new_distribution, salary_bank)
-
-    # Try all possible combinations
-    all_banks = ['UOB One', 'SC BonusSaver', 'OCBC 360', 'BOC SmartSaver', 'Chocolate']
+        # Only the winning allocations need the per-tier breakdown. The DP ranks in
+        # float32, so their totals are recomputed here at full precision.
+        solutions = []
+        for dp_interest, allocation in zip(values[total_steps], allocations[total_steps]):
+            if not np.isfinite(dp_interest):
+                continue
+            steps_by_bank = dict(zip(banks, allocation))
+            distribution = {}
+            all_breakdowns = {}
+            total_interest = 0
+            for bank in display_order:
+                if steps_by_bank[bank] > 0:
+                    distribution[bank] = int(steps_by_bank[bank]) * step
+                    result = calculate_bank_interest(
+                        distribution[bank], banks_data[bank], bank_requirements(bank, salary_bank)
+                    )
+                    total_interest += result['total_interest']
+                    all_breakdowns[bank] = result['breakdown']
+            solutions.append({
+                'distribution': distribution,
+                'total_interest': total_interest,
+                'breakdown': all_breakdowns,
+                'salary_bank': salary_bank
+            })
+        return solutions
+
+    # Interest tables without salary credit are shared by every scenario, and the
+    # banks that never take salary credit are folded into the DP state only once
+    tables = {bank: interest_table(bank, None) for bank in all_banks}
+    shared_best = empty_state()
+    for bank in other_banks:
+        shared_best = add_bank(shared_best, tables[bank])
+    
+    candidates = []
     
     # First try with salary credit
     if user_requirements['has_salary']:
-        for salary_bank in ['SC BonusSaver', 'OCBC 360', 'BOC SmartSaver']:
-            status_text.write(f"Trying combinations with salary credit to {salary_bank}...")
+        for salary_bank in salary_banks:
+            best = shared_best
+            for bank in salary_banks:
+                table = interest_table(bank, salary_bank) if bank == salary_bank else tables[bank]
+                best = add_bank(best, table)
             non_salary_banks = [bank for bank in all_banks if bank != salary_bank]
-            # Try salary bank first
-            for amount in range(0, min(total_amount + 5000, bonus_caps[salary_bank] + 5000), 5000):
-                if amount <= total_amount:
-                    initial_distribution = {salary_bank: amount} if amount > 0 else {}
-                    try_all_combinations(total_amount - amount, non_salary_banks, initial_distribution, salary_bank)
+            candidates.extend(to_solutions(best, other_banks + salary_banks, salary_bank, [salary_bank] + non_salary_banks))
     
     # Then try without salary credit
-    status_text.write("Trying combinations without salary credit...")
-    try_all_combinations(total_amount, ['UOB One', 'SC BonusSaver', 'OCBC 360', 'BOC SmartSaver', 'Chocolate'], {}, None)
+    best = shared_best
+    for bank in salary_banks:
+        best = add_bank(best, tables[bank])
+    candidates.extend(to_solutions(best, other_banks + salary_banks, None, all_banks))
+
+    # Keep the top 3 overall; the stable sort lets earlier scenarios win ties
+    candidates = [c for c in candidates if c['total_interest'] > 0]
+    candidate_interest = np.array([c['total_interest'] for c in candidates], dtype=float)
+    order = np.argsort(-candidate_interest, kind='stable')[:num_solutions]
+    top_solutions = [candidates[i] for i in order]
+    while len(top_solutions) < num_solutions:
+        top_solutions.append({'distribution': {}, 'total_interest': 0, 'breakdown': {}, 'salary_bank': None})
+
+    return top_solutions
 
-    status_text.write("Optimization complete!")
-    progress_text.empty()  # Clear the progress counter
-    best_found_text.empty()  # Clear the best found message
+def optimize_bank_distribution(total_amount, banks_data, user_requirements, file_mtime):
+    top_solutions = find_top_distributions(total_amount, banks_data, user_requirements, file_mtime)
     
     # Display final results
     st.write("\n### Final Top 3 Solutions:")
@@ -439,26 +515,35 @@ def optimize_bank_distribution(total_amount, banks_data, user_requirements):
 def format_number(n):
     return "{:,}".format(n)
 
+def format_breakdown_lines(breakdown):
+    """Format an interest breakdown as bullet lines, one column at a time"""
+    tiers = pd.DataFrame(breakdown)
+    amount_strs = tiers['amount_in_tier'].astype(float).map("${:,.2f}".format)
+    rate_strs = (tiers['tier_rate'].astype(float) * 100).map("{:.2f}%".format)
+    descriptions = tiers['description'].astype(str).str.strip()
+    return ("• " + amount_strs + " at " + rate_strs + " - " + descriptions).tolist()
+
 def show_interest_rates_page(banks_data):
     st.title("Bank Interest Rates")
     st.write("Current interest rates and requirements for supported banks. Updated as of 16 Jan 2025.")
     
-    # Convert banks_data dictionary to a list of records
-    records = []
+    # Build the table column by column rather than from per-tier row dicts
+    cols = ['tier_type', 'balance_tier', 'interest_rate', 'requirement_type', 'remarks']
+    columns = {'bank': [], **{col: [] for col in cols}}
     for bank_name, bank_info in banks_data.items():
         for tier in bank_info['tiers']:
-            tier['bank'] = bank_name  # Add bank name to each tier
-            records.append(tier)
+            columns['bank'].append(bank_name)
+            for col in cols:
+                columns[col].append(tier[col])
     
     # Convert to DataFrame
-    interest_rates_df = pd.DataFrame(records)
+    interest_rates_df = pd.DataFrame(columns)
     
     for bank in interest_rates_df['bank'].unique():
         st.header(f"{bank}")
         bank_data = interest_rates_df[interest_rates_df['bank'] == bank]
         
         # Create a formatted table for each bank
-        cols = ['tier_type', 'balance_tier', 'interest_rate', 'requirement_type', 'remarks']
         display_df = bank_data[cols].copy()
         display_df.columns = ['Tier Type', 'Balance Tier', 'Interest Rate (%)', 'Requirement', 'Remarks']
         
@@ -497,6 +582,9 @@ st.markdown("""
 
 def streamlit_app():
     try:
+        # Interest results are only reused within a single rerun
+        _calc_interest_cached.cache_clear()
+
         # User identification
         user_id = identify_user()
         variant = assign_variant()
@@ -510,7 +598,8 @@ def streamlit_app():
             })
 
         # Then: Load interest rates data
-        banks_data = process_interest_rates()
+        rates_mtime = os.path.getmtime('interest_rates.csv')
+        banks_data = process_interest_rates('interest_rates.csv', rates_mtime)
         
         st.title("🏦 SmartSaverSG")
         st.subheader("Maximize Your Savings with Bank Interest Calculator")
@@ -713,8 +802,9 @@ def streamlit_app():
                                 'breakdown': results['breakdown']
                             })
                         
-                        # Sort banks by interest rate (highest to lowest)
-                        bank_results.sort(key=lambda x: x['annual_interest'], reverse=True)
+                        # Sort banks by interest rate (highest to lowest), keeping list order on ties
+                        annual_interest = np.array([r['annual_interest'] for r in bank_results], dtype=float)
+                        bank_results = [bank_results[i] for i in np.argsort(-annual_interest, kind='stable')]
                         
                         # Display Optimal Bank First
                         optimal_bank = bank_results[0]
@@ -729,26 +819,8 @@ def streamlit_app():
                         # Show breakdown for optimal bank
                         if optimal_bank['breakdown']:
                             st.write("Interest Breakdown:")
-                            for tier in optimal_bank['breakdown']:
-                                try:
-                                    # Convert all values to basic Python types first
-                                    amount_val = float(tier['amount_in_tier'])
-                                    rate_val = float(tier['tier_rate'])
-                                    desc_val = str(tier['description']).strip()
-                                    
-                                    # Build string piece by piece
-                                    bullet = "•"
-                                    amount_str = "${:,.2f}".format(amount_val)
-                                    rate_str = "{:.2f}%".format(rate_val * 100)
-                                    
-                                    # Combine with explicit spaces
-                                    line = f"{bullet} {amount_str} at {rate_str} - {desc_val}"
-                                    
-                                    # Display using text
-                                    st.text(line)
-                                    
-                                except Exception as e:
-                                    st.error(f"Error formatting tier {i}: {str(e)}")
+                            for line in format_breakdown_lines(optimal_bank['breakdown']):
+                                st.text(line)
                         
                         # Divider between optimal and all results
                         st.markdown("---")
@@ -784,26 +856,8 @@ def streamlit_app():
                                 # Show breakdown with fixed formatting
                                 if result['breakdown']:
                                     st.write("Interest Breakdown:")
-                                    for tier in result['breakdown']:
-                                        try:
-                                            # Convert all values to basic Python types first
-                                            amount_val = float(tier['amount_in_tier'])
-                                            rate_val = float(tier['tier_rate'])
-                                            desc_val = str(tier['description']).strip()
-                                            
-                                            # Build string piece by piece
-                                            bullet = "•"
-                                            amount_str = "${:,.2f}".format(amount_val)
-                                            rate_str = "{:.2f}%".format(rate_val * 100)
-                                            
-                                            # Combine with explicit spaces
-                                            line = f"{bullet} {amount_str} at {rate_str} - {desc_val}"
-                                            
-                                            # Display using text
-                                            st.text(line)
-                                            
-                                        except Exception as e:
-                                            st.error(f"Error formatting tier {i}: {str(e)}")
+                                    for line in format_breakdown_lines(result['breakdown']):
+                                        st.text(line)
             
             with tab2:
                 st.write("""
@@ -820,7 +874,8 @@ def streamlit_app():
                         top_solutions = optimize_bank_distribution(
                             investment_amount,
                             banks_data,
-                            base_requirements
+                            base_requirements,
+                            rates_mtime
                         )
                         
                         # Then optimize spend allocation for each solution
@@ -912,6 +967,31 @@ def optimize_spend_allocation(total_spend, banks_data, deposit_amounts, base_req
         'BOC SmartSaver': 500
     }
     
+    # Start optimization with all banks
+    eligible_banks = [bank for bank in min_spends.keys() 
+                     if bank in deposit_amounts and deposit_amounts[bank] > 0]
+    lowest_min_spend = min(min_spends.values())
+    
+    # Interest for every spend level the search can give each bank, computed once;
+    # leaves look up totals and the winner's breakdown instead of recalculating them
+    spend_results = {}
+    for bank in eligible_banks:
+        bank_reqs = base_requirements.copy()
+        # Special handling for UOB One
+        if bank == 'UOB One':
+            bank_reqs['meets_criteria_a'] = base_requirements.get('meets_criteria_a', False)
+            bank_reqs['has_salary'] = False  # UOB One uses meets_criteria_a instead
+        
+        spend_levels = [min_spends[bank]] + ([1500] if bank == 'BOC SmartSaver' else [])
+        spend_results[bank] = {
+            spend: calculate_bank_interest(
+                deposit_amounts.get(bank, 0),
+                banks_data[bank],
+                {**bank_reqs, 'spend_amount': spend}
+            )
+            for spend in spend_levels
+        }
+    
     best_allocation = {}
     best_total_interest = 0
     best_breakdown = {}
@@ -920,32 +1000,16 @@ def optimize_spend_allocation(total_spend, banks_data, deposit_amounts, base_req
         nonlocal best_allocation, best_total_interest, best_breakdown
         
         # Base case: no more spend to allocate or no more banks
-        if not remaining_banks or remaining_spend < min(min_spends.values()):
+        if not remaining_banks or remaining_spend < lowest_min_spend:
             # Calculate total interest with current allocation
-            total_interest = 0
-            interest_breakdown = {}
-            
-            for bank, spend in current_allocation.items():
-                bank_reqs = base_requirements.copy()
-                bank_reqs['spend_amount'] = spend
-                
-                # Special handling for UOB One
-                if bank == 'UOB One':
-                    bank_reqs['meets_criteria_a'] = base_requirements.get('meets_criteria_a', False)
-                    bank_reqs['has_salary'] = False  # UOB One uses meets_criteria_a instead
-                
-                result = calculate_bank_interest(
-                    deposit_amounts.get(bank, 0), 
-                    banks_data[bank], 
-                    bank_reqs
-                )
-                total_interest += result['total_interest']
-                interest_breakdown[bank] = result
+            total_interest = sum(
+                spend_results[bank][spend]['total_interest'] for bank, spend in current_allocation.items()
+            )
             
             if total_interest > best_total_interest:
                 best_allocation = current_allocation.copy()
                 best_total_interest = total_interest
-                best_breakdown = interest_breakdown
+                best_breakdown = {bank: spend_results[bank][spend] for bank, spend in current_allocation.items()}
             return
         
         # Try allocating spend to next bank
@@ -978,9 +1042,6 @@ def optimize_spend_allocation(total_spend, banks_data, deposit_amounts, base_req
                     new_allocation
                 )
     
-    # Start optimization with all banks
-    eligible_banks = [bank for bank in min_spends.keys() 
-                     if bank in deposit_amounts and deposit_amounts[bank] > 0]
     try_allocation(total_spend, eligible_banks, {})
     
     return best_allocation, best_total_interest, best_breakdown